@@ -0,0 +1,14 @@
+"""
+FastAPI dependencies providing the services created at application startup.
+"""
+
+from fastapi import HTTPException, Request
+from ..chains.rag_chain import RAGChain
+
+
+def get_rag_chain(request: Request) -> RAGChain:
+    """Get the RAG chain stored on the application state."""
+    rag_chain = getattr(request.app.state, "rag_chain", None)
+    if rag_chain is None:
+        raise HTTPException(status_code=503, detail="RAG chain is not available")
+    return rag_chain
@@ -4,12 +4,15 @@ Implements the /chat endpoint with Server-Sent Events streaming.
 """
 
 import json
-from typing import Optional
-from fastapi import APIRouter, HTTPException, Query
+from functools import lru_cache
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
-from sse_starlette.sse import EventSourceResponse
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 import logging
-from ..chains.rag_chain import get_rag_chain
+from pydantic import BaseModel, Field, StringConstraints
+from ..chains.rag_chain import RAGChain
+from .dependencies import get_rag_chain
 from ..core.utils import create_sse_message, log_error
 
 
@@ -17,27 +20,42 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-async def stream_chat_response(query: str, use_search: bool = True):
+class ChatRequest(BaseModel):
+    """Request body for the POST /chat endpoint."""
+    
+    # Stripped and length-checked by pydantic-core before the handler runs
+    query: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)] = Field(
+        ..., description="The user's query/question"
+    )
+    use_search: bool = Field(True, description="Whether to use web search for context")
+
+
+@lru_cache(maxsize=128)
+def encode_status_event(event: str, data: str) -> bytes:
+    """Encode a non-token SSE event once; EventSourceResponse sends bytes verbatim."""
+    return ServerSentEvent(data=data, event=event).encode()
+
+
+async def stream_chat_response(rag_chain: RAGChain, query: str, use_search: bool = True):
     """Generate streaming response for chat endpoint."""
     try:
-        rag_chain = get_rag_chain()
-        
         async for chunk in rag_chain.stream(query, use_search):
-            # EventSourceResponse will handle SSE formatting
-            yield chunk
+            if chunk["event"] == "token":
+                yield ServerSentEvent(data=chunk["data"], event="token")
+            else:
+                # Status messages repeat across requests, so reuse their encoded frames
+                yield encode_status_event(chunk["event"], chunk["data"])
             
     except Exception as e:
         log_error(e, "Chat streaming response")
-        yield {
-            "type": "error",
-            "message": f"Streaming error: {str(e)}"
-        }
+        yield ServerSentEvent(data=f"Streaming error: {str(e)}", event="error")
 
 
 @router.get("/chat")
 async def chat_stream(
     query: str = Query(..., description="The user's query/question"),
-    use_search: bool = Query(True, description="Whether to use web search for context")
+    use_search: bool = Query(True, description="Whether to use web search for context"),
+    rag_chain: RAGChain = Depends(get_rag_chain)
 ):
     """
     Stream chat responses using Server-Sent Events.
@@ -56,7 +74,7 @@ async def chat_stream(
         logger.info(f"Chat request received - Query: {query[:100]}{'...' if len(query) > 100 else ''}")
         
         return EventSourceResponse(
-            stream_chat_response(query.strip(), use_search),
+            stream_chat_response(rag_chain, query.strip(), use_search),
             media_type="text/event-stream"
         )
         
@@ -69,7 +87,8 @@ async def chat_stream(
 
 @router.post("/chat")
 async def chat_stream_post(
-    request: dict
+    body: ChatRequest,
+    rag_chain: RAGChain = Depends(get_rag_chain)
 ):
     """
     Stream chat responses using Server-Sent Events (POST version).
@@ -79,18 +98,16 @@ async def chat_stream_post(
             "query": "Your question here",
             "use_search": true
         }
+    
+    Empty or whitespace-only queries are rejected with a 422 validation error.
     """
     try:
-        query = request.get("query")
-        use_search = request.get("use_search", True)
-        
-        if not query or not query.strip():
-            raise HTTPException(status_code=400, detail="Query is required and cannot be empty")
+        query = body.query
         
         logger.info(f"Chat POST request received - Query: {query[:100]}{'...' if len(query) > 100 else ''}")
         
         return EventSourceResponse(
-            stream_chat_response(query.strip(), use_search),
+            stream_chat_response(rag_chain, query, body.use_search),
             media_type="text/event-stream"
         )
         
@@ -104,7 +121,8 @@ async def chat_stream_post(
 @router.get("/chat/simple")
 async def chat_simple(
     query: str = Query(..., description="The user's query/question"),
-    use_search: bool = Query(True, description="Whether to use web search for context")
+    use_search: bool = Query(True, description="Whether to use web search for context"),
+    rag_chain: RAGChain = Depends(get_rag_chain)
 ):
     """
     Get a simple, non-streaming chat response.
@@ -122,7 +140,6 @@ async def chat_simple(
         
         logger.info(f"Simple chat request - Query: {query[:100]}{'...' if len(query) > 100 else ''}")
         
-        rag_chain = get_rag_chain()
         result = await rag_chain.run_with_metadata(query.strip(), use_search)
         
         return {
@@ -3,94 +3,447 @@ RAG (Retrieval-Augmented Generation) chain implementation.
 Combines Tavily search with Groq LLM for enhanced responses.
 """
 
-from typing import AsyncGenerator, Dict, Any, Optional
+from typing import AsyncGenerator, Awaitable, Callable, Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import copy
+import hashlib
 import logging
-from ..services.llm_service import get_llm_service
-from ..services.search_service import get_search_service
+import time
+from ..services.llm_service import LLMService, is_error_response
+from ..services.search_service import SearchService
+from ..core.config import get_settings
+from ..core.disk_cache import DiskResponseCache
 from ..core.utils import log_error
 
 
-class RAGChain:
-    """Retrieval-Augmented Generation chain combining search and LLM."""
+logger = logging.getLogger(__name__)
+
+
+# Number of no-context tokens to buffer while waiting for search results
+SPECULATIVE_TOKENS = 8
+
+# Streamed tokens are batched until this many characters or seconds accumulate
+TOKEN_BATCH_CHARS = 32
+TOKEN_BATCH_INTERVAL = 0.02
+
+
+async def _collect_first_n_tokens(stream: AsyncGenerator[str, None], n: int) -> List[str]:
+    """Read up to n tokens from a stream, leaving it open for further reads."""
+    tokens = []
+    async for token in stream:
+        tokens.append(token)
+        if len(tokens) >= n:
+            break
+    return tokens
+
+
+async def _coalesce_tokens(
+    stream: AsyncGenerator[str, None],
+    min_chars: int = TOKEN_BATCH_CHARS,
+    interval: float = TOKEN_BATCH_INTERVAL
+) -> AsyncGenerator[str, None]:
+    """Group streamed tokens into larger chunks, flushing on size or elapsed time."""
+    loop = asyncio.get_running_loop()
+    buffer = []
+    size = 0
+    deadline = None
+    next_token = None
+    try:
+        while True:
+            # Keep one pending read across flushes so a timeout never cancels the stream
+            if next_token is None:
+                next_token = asyncio.ensure_future(anext(stream))
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            await asyncio.wait({next_token}, timeout=timeout)
+            
+            if next_token.done():
+                try:
+                    token = next_token.result()
+                except StopAsyncIteration:
+                    break
+                next_token = None
+                if not buffer:
+                    deadline = loop.time() + interval
+                buffer.append(token)
+                size += len(token)
+                if size < min_chars and loop.time() < deadline:
+                    continue
+            
+            if buffer:
+                yield "".join(buffer)
+            buffer = []
+            size = 0
+            deadline = None
+        
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if next_token is not None and not next_token.done():
+            next_token.cancel()
+            await asyncio.gather(next_token, return_exceptions=True)
+        await stream.aclose()
+
+
+class _StreamBroadcast:
+    """Fan-out of one in-flight stream's events to concurrent identical requests."""
     
     def __init__(self):
-        self.llm_service = get_llm_service()
-        self.search_service = None  # Initialize lazily
-        self.logger = logging.getLogger(__name__)
+        self.events: List[Dict[str, Any]] = []
+        self.finished = False
+        self.completed = False
+        self._changed = asyncio.Event()
+    
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+    
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Record an event and wake up subscribers."""
+        self.events.append(event)
+        self._notify()
+    
+    def finish(self, completed: bool) -> None:
+        """Mark the stream as ended, successfully or not."""
+        self.finished = True
+        self.completed = completed
+        self._notify()
+    
+    async def subscribe(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield every event published so far, then new ones until the stream ends."""
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.finished:
+                return
+            await self._changed.wait()
+
+
+class SmartResponseCache:
+    """Bounded LRU cache with per-entry TTL for complete chain responses."""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
     
-    def _get_search_service(self):
-        """Get search service lazily, handle missing API key gracefully."""
-        if self.search_service is None:
+    @staticmethod
+    def make_key(kind: str, query: str, use_search: bool) -> str:
+        """Build a cache key from the normalized query and generation settings."""
+        settings = get_settings()
+        raw = (
+            f"{kind}|{query.strip().lower()}|{use_search}|"
+            f"{settings.groq_model}|{settings.temperature}|{settings.max_tokens}"
+        )
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class RAGChain:
+    """Retrieval-Augmented Generation chain combining search and LLM."""
+    
+    def __init__(self, llm_service: LLMService, search_service: Optional[SearchService] = None):
+        self.llm_service = llm_service
+        self.search_service = search_service  # None when search is unavailable
+        settings = get_settings()
+        self.response_cache = SmartResponseCache(
+            maxsize=settings.response_cache_size,
+            ttl=settings.response_cache_ttl
+        )
+        self.disk_cache = None
+        if settings.response_disk_cache_path:
+            try:
+                self.disk_cache = DiskResponseCache(
+                    settings.response_disk_cache_path,
+                    maxsize=settings.response_disk_cache_size,
+                    ttl=settings.response_disk_cache_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Disk response cache unavailable: {e}")
+        self.speculative_window = settings.speculative_window
+        # Work in progress for identical concurrent requests, keyed by cache key
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_streams: Dict[str, _StreamBroadcast] = {}
+        self.semantic_cache = None
+        if settings.semantic_cache_enabled:
             try:
-                self.search_service = get_search_service()
+                from ..services.semantic_cache import SemanticCache
+                self.semantic_cache = SemanticCache()
             except Exception as e:
-                self.logger.warning(f"Search service unavailable: {e}")
-                self.search_service = False  # Mark as unavailable
-        return self.search_service if self.search_service is not False else None
+                logger.warning(f"Semantic cache unavailable: {e}")
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return response cache statistics."""
+        return self.response_cache.stats()
+    
+    def close(self) -> None:
+        """Release resources held by the chain's caches."""
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+    
+    async def _cache_get(self, cache_key: str) -> Optional[Any]:
+        """Look up a response in memory, falling back to the disk cache."""
+        cached = self.response_cache.get(cache_key)
+        if cached is None and self.disk_cache is not None:
+            cached = await self.disk_cache.get(cache_key)
+            if cached is not None:
+                self.response_cache.set(cache_key, cached)
+        return cached
+    
+    async def _cache_set(self, cache_key: str, value: Any, persist: bool = True) -> None:
+        """Store a response in memory and, if persist is set, on disk."""
+        self.response_cache.set(cache_key, value)
+        if persist and self.disk_cache is not None:
+            await self.disk_cache.set(cache_key, value)
+    
+    async def _semantic_lookup(self, query: str, use_search: bool) -> Tuple[Optional[Any], Optional[str]]:
+        """Embed the query and look up a cached answer for a similar query."""
+        if self.semantic_cache is None:
+            return None, None
+        try:
+            query_vector = await self.semantic_cache.embed(query)
+            return query_vector, self.semantic_cache.get(query_vector, use_search)
+        except Exception as e:
+            log_error(e, "Semantic cache lookup")
+            return None, None
+    
+    async def _store_response(
+        self,
+        cache_key: str,
+        query_vector: Optional[Any],
+        use_search: bool,
+        response: str,
+        searched: bool
+    ) -> None:
+        """Store a generated answer in the exact and semantic caches."""
+        # Answers to real-time queries go stale quickly, so they are not persisted to disk
+        await self._cache_set(cache_key, response, persist=not searched)
+        if query_vector is not None:
+            self.semantic_cache.set(query_vector, use_search, response)
+    
+    async def _speculate(self, query: str, search_task: asyncio.Task) -> AsyncGenerator[str, None]:
+        """
+        Stream a no-context answer while a search is running.
+        
+        Nothing is yielded if the search returns results within the speculative
+        window. Otherwise tokens are yielded until the answer ends or the search
+        returns results, at which point the speculative stream is cancelled.
+        """
+        speculative_stream = self.llm_service.stream_response(query, None)
+        first_tokens = asyncio.create_task(_collect_first_n_tokens(speculative_stream, SPECULATIVE_TOKENS))
+        next_token = None
+        try:
+            # Give the search the whole window while the first tokens buffer in the background
+            await asyncio.wait({search_task}, timeout=self.speculative_window)
+            if search_task.done() and search_task.result():
+                return
+            
+            # Keep racing the search until the first speculative tokens are ready
+            while not first_tokens.done():
+                waiters = {first_tokens} if search_task.done() else {first_tokens, search_task}
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                if search_task.done() and search_task.result():
+                    return
+            
+            for token in first_tokens.result():
+                yield token
+            
+            while True:
+                if next_token is None:
+                    next_token = asyncio.ensure_future(anext(speculative_stream))
+                waiters = {next_token} if search_task.done() else {next_token, search_task}
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                
+                if search_task.done() and search_task.result():
+                    return
+                if next_token.done():
+                    try:
+                        token = next_token.result()
+                    except StopAsyncIteration:
+                        return
+                    next_token = None
+                    yield token
+        finally:
+            pending = [task for task in (first_tokens, next_token) if task is not None and not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await speculative_stream.aclose()
+    
+    async def _singleflight(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run compute once per key at a time; concurrent callers share its result."""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                return copy.deepcopy(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leading call was cancelled, so compute the result ourselves
+        
+        future = asyncio.get_running_loop().create_future()
+        # Mark failures as retrieved when no other caller is waiting on them
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await compute()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
     
     async def run(self, query: str, use_search: bool = True) -> str:
         """Run the RAG chain and return a complete response."""
         try:
-            context = None
+            cache_key = self.response_cache.make_key("answer", query, use_search)
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached response")
+                return cached
             
-            if use_search:
-                search_service = self._get_search_service()
-                # Check if search is needed and available
-                if search_service and search_service.is_search_needed(query):
-                    self.logger.info(f"Running search for query: {query}")
-                    context = await search_service.search_and_format(query)
-                else:
-                    if not search_service:
-                        self.logger.info("Search service unavailable, using LLM only")
-                    else:
-                        self.logger.info("Search not needed for this query")
+            query_vector, cached = await self._semantic_lookup(query, use_search)
+            if cached is not None:
+                self.response_cache.set(cache_key, cached)
+                return cached
             
-            # Generate response using LLM with optional context
-            response = await self.llm_service.generate_response(query, context)
-            return response
+            return await self._singleflight(
+                cache_key,
+                lambda: self._answer(query, use_search, cache_key, query_vector)
+            )
             
         except Exception as e:
             log_error(e, "RAG chain execution")
             return f"Sorry, I encountered an error while processing your request: {str(e)}"
     
+    async def _answer(self, query: str, use_search: bool, cache_key: str, query_vector: Optional[Any]) -> str:
+        """Search if needed, generate an answer and cache it."""
+        context = None
+        searched = False
+        
+        if use_search:
+            search_service = self.search_service
+            # Check if search is needed and available
+            if search_service and search_service.is_search_needed(query):
+                logger.info("Running search for query: %s", query)
+                searched = True
+                context = await search_service.search_and_format(query)
+            else:
+                if not search_service:
+                    logger.info("Search service unavailable, using LLM only")
+                else:
+                    logger.info("Search not needed for this query")
+        
+        # Generate response using LLM with optional context
+        response = await self.llm_service.generate_response(query, context)
+        if not is_error_response(response):
+            await self._store_response(cache_key, query_vector, use_search, response, searched)
+        return response
+    
     async def stream(self, query: str, use_search: bool = True) -> AsyncGenerator[Dict[str, Any], None]:
         """Run the RAG chain with streaming response."""
         try:
-            context = None
-            search_results = []
-            
             # Yield initial status using proper SSE format
             yield {"data": "Processing your request...", "event": "status"}
             
-            if use_search:
-                search_service = self._get_search_service()
-                # Check if search is needed and available
-                if search_service and search_service.is_search_needed(query):
-                    yield {"data": "Searching for relevant information...", "event": "status"}
-                    
-                    # Get search results
-                    search_results = await search_service.search(query)
-                    context = search_service._format_search_results(search_results)
-                    
-                    # Yield search completion
-                    yield {
-                        "data": f"Found {len(search_results)} relevant sources",
-                        "event": "search_complete"
-                    }
-                else:
-                    if not search_service:
-                        yield {"data": "Search unavailable, using existing knowledge...", "event": "status"}
-                    else:
-                        yield {"data": "Using existing knowledge...", "event": "status"}
-            
-            # Start streaming LLM response
-            yield {"data": "Generating response...", "event": "status"}
+            cache_key = self.response_cache.make_key("answer", query, use_search)
+            cached = await self._cache_get(cache_key)
+            query_vector = None
+            if cached is None:
+                query_vector, cached = await self._semantic_lookup(query, use_search)
+                if cached is not None:
+                    self.response_cache.set(cache_key, cached)
+            if cached is not None:
+                yield {"data": "Using cached response...", "event": "status"}
+                # Replay the stored answer in fixed-size slices to keep the token protocol
+                for i in range(0, len(cached), TOKEN_BATCH_CHARS):
+                    yield {"data": cached[i:i + TOKEN_BATCH_CHARS], "event": "token"}
+                yield {"data": "Response complete", "event": "complete"}
+                return
             
-            async for token in self.llm_service.stream_response(query, context):
-                yield {"data": token, "event": "token"}
+            # Follow an identical request that is already streaming instead of repeating its work
+            broadcast = self._inflight_streams.get(cache_key)
+            if broadcast is not None:
+                relayed = False
+                async for event in broadcast.subscribe():
+                    relayed = relayed or event["event"] == "token"
+                    yield event
+                if broadcast.completed:
+                    return
+                if relayed:
+                    # The leading request was abandoned midway, so generate our own answer
+                    yield {"data": "Restarting response...", "event": "restart"}
             
-            # Yield completion status
-            yield {"data": "Response complete", "event": "complete"}
+            broadcast = _StreamBroadcast()
+            self._inflight_streams[cache_key] = broadcast
+            answer_stream = self._stream_answer(query, use_search, cache_key, query_vector)
+            try:
+                async for event in answer_stream:
+                    broadcast.publish(event)
+                    if event["event"] == "complete":
+                        broadcast.finish(completed=True)
+                    yield event
+            finally:
+                # Close the answer stream now so its cleanup runs even if the client disconnected
+                await answer_stream.aclose()
+                if not broadcast.finished:
+                    broadcast.finish(completed=False)
+                if self._inflight_streams.get(cache_key) is broadcast:
+                    del self._inflight_streams[cache_key]
             
         except Exception as e:
             log_error(e, "RAG chain streaming")
@@ -99,35 +452,93 @@ class RAGChain:
                 "event": "error"
             }
     
+    async def _stream_answer(
+        self,
+        query: str,
+        use_search: bool,
+        cache_key: str,
+        query_vector: Optional[Any]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Search if needed, stream an answer as SSE events and cache it."""
+        context = None
+        tokens = []
+        speculated = False
+        searched = False
+        
+        if use_search:
+            search_service = self.search_service
+            # Check if search is needed and available
+            if search_service and search_service.is_search_needed(query):
+                yield {"data": "Searching for relevant information...", "event": "status"}
+                searched = True
+                
+                # Get search results, speculatively answering without context meanwhile
+                search_task = asyncio.create_task(search_service.search(query))
+                try:
+                    if self.speculative_window > 0:
+                        speculated = True
+                        async for token in _coalesce_tokens(self._speculate(query, search_task)):
+                            if not tokens:
+                                yield {"data": "Generating response...", "event": "status"}
+                            tokens.append(token)
+                            yield {"data": token, "event": "token"}
+                    search_results = await search_task
+                finally:
+                    # Don't leave the search running if the client went away mid-stream
+                    if not search_task.done():
+                        search_task.cancel()
+                
+                if search_results or not speculated:
+                    if tokens:
+                        # Discard the speculative answer in favour of one grounded in the results
+                        yield {"data": "Restarting with search results...", "event": "restart"}
+                        tokens = []
+                    speculated = False
+                    context = search_service._format_search_results(search_results)
+                
+                # Yield search completion
+                yield {
+                    "data": f"Found {len(search_results)} relevant sources",
+                    "event": "search_complete"
+                }
+            else:
+                if not search_service:
+                    yield {"data": "Search unavailable, using existing knowledge...", "event": "status"}
+                else:
+                    yield {"data": "Using existing knowledge...", "event": "status"}
+        
+        if not speculated:
+            # Start streaming LLM response
+            yield {"data": "Generating response...", "event": "status"}
+            
+            async for token in _coalesce_tokens(self.llm_service.stream_response(query, context)):
+                tokens.append(token)
+                yield {"data": token, "event": "token"}
+        
+        answer = "".join(tokens)
+        if answer and not is_error_response(answer):
+            await self._store_response(cache_key, query_vector, use_search, answer, searched)
+        
+        # Yield completion status
+        yield {"data": "Response complete", "event": "complete"}
+    
     async def run_with_metadata(self, query: str, use_search: bool = True) -> Dict[str, Any]:
         """Run the RAG chain and return response with metadata."""
         try:
-            result = {
-                "query": query,
-                "response": "",
-                "search_used": False,
-                "search_results": [],
-                "context_length": 0,
-                "error": None
-            }
-            
-            context = None
-            
-            if use_search:
-                search_service = self._get_search_service()
-                if search_service and search_service.is_search_needed(query):
-                    self.logger.info(f"Running search for query: {query}")
-                    search_results = await search_service.search(query)
-                    context = search_service._format_search_results(search_results)
-                    
-                    result["search_used"] = True
-                    result["search_results"] = search_results
-                    result["context_length"] = len(context) if context else 0
-            
-            # Generate response
-            response = await self.llm_service.generate_response(query, context)
-            result["response"] = response
+            cache_key = self.response_cache.make_key("metadata", query, use_search)
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("Returning cached response with metadata")
+                result = copy.deepcopy(cached)
+                result["query"] = query
+                return result
             
+            result = await self._singleflight(
+                cache_key,
+                lambda: self._answer_with_metadata(query, use_search, cache_key)
+            )
+            # Identical requests share one result, so report this caller's own query
+            result["query"] = query
             return result
             
         except Exception as e:
@@ -140,14 +551,35 @@ class RAGChain:
                 "context_length": 0,
                 "error": str(e)
             }
-
-
-# Global RAG chain instance
-_rag_chain: Optional[RAGChain] = None
-
-def get_rag_chain() -> RAGChain:
-    """Get or create the RAG chain instance."""
-    global _rag_chain
-    if _rag_chain is None:
-        _rag_chain = RAGChain()
-    return _rag_chain
\ No newline at end of file
+    
+    async def _answer_with_metadata(self, query: str, use_search: bool, cache_key: str) -> Dict[str, Any]:
+        """Search if needed, generate an answer with metadata and cache it."""
+        result = {
+            "query": query,
+            "response": "",
+            "search_used": False,
+            "search_results": [],
+            "context_length": 0,
+            "error": None
+        }
+        
+        context = None
+        
+        if use_search:
+            search_service = self.search_service
+            if search_service and search_service.is_search_needed(query):
+                logger.info("Running search for query: %s", query)
+                search_results = await search_service.search(query)
+                context = search_service._format_search_results(search_results)
+                
+                result["search_used"] = True
+                result["search_results"] = search_results
+                result["context_length"] = len(context) if context else 0
+        
+        # Generate response
+        response = await self.llm_service.generate_response(query, context)
+        result["response"] = response
+        
+        if not is_error_response(response):
+            await self._cache_set(cache_key, copy.deepcopy(result), persist=not result["search_used"])
+        return result
\ No newline at end of file
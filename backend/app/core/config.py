@@ -4,6 +4,7 @@ Manages environment variables and application settings.
 """
 
 import os
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -19,9 +20,28 @@ class Settings(BaseSettings):
     groq_model: str = "llama-3.1-8b-instant"
     max_tokens: int = 1000
     temperature: float = 0.7
+    speculative_window: float = 0.0
     
     # Search Configuration
     tavily_max_results: int = 5
+    search_context_cache_size: int = 256
+    
+    # Cache Configuration
+    response_cache_size: int = 1024
+    response_cache_ttl: int = 600
+    response_disk_cache_path: Optional[str] = None
+    response_disk_cache_size: int = 10000
+    response_disk_cache_ttl: int = 86400
+    semantic_cache_enabled: bool = False
+    semantic_cache_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_size: int = 1024
+    
+    # HTTP Client Configuration
+    http_timeout: float = 30.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
     
     # Server Configuration
     host: str = "0.0.0.0"
@@ -38,9 +58,7 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-# Global settings instance
-settings = Settings()
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get the current settings instance."""
-    return settings
\ No newline at end of file
+    """Get the settings instance, created on first use."""
+    return Settings()
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Disk-backed response cache using SQLite.
+Keeps generated responses across restarts as a second tier behind the in-memory cache.
+"""
+
+from typing import Any, Optional
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from .utils import log_error
+
+
+logger = logging.getLogger(__name__)
+
+
+class DiskResponseCache:
+    """SQLite key/value store with per-entry expiry and a bounded entry count."""
+
+    def __init__(self, path: str, maxsize: int = 10000, ttl: float = 86400):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._initialize_database()
+
+    def _initialize_database(self) -> None:
+        """Open the database file and create the cache table."""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)"
+                )
+            logger.info(f"Disk response cache initialized at: {self.path}")
+        except Exception as e:
+            log_error(e, "Disk cache initialization")
+            raise
+
+    def _get_sync(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set_sync(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl)
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            # Drop the entries closest to expiry once the size limit is exceeded
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY expires_at ASC "
+                "LIMIT MAX((SELECT COUNT(*) FROM responses) - ?, 0))",
+                (self.maxsize,)
+            )
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return a cached value, or None if missing, expired or unreadable."""
+        try:
+            return await asyncio.to_thread(self._get_sync, key)
+        except Exception as e:
+            log_error(e, "Disk cache read")
+            return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value without blocking the event loop."""
+        try:
+            await asyncio.to_thread(self._set_sync, key, value)
+        except Exception as e:
+            log_error(e, "Disk cache write")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,20 @@
+"""
+Shared HTTP client for outbound API calls.
+Keeps a single pooled connection set so requests reuse TCP and TLS sessions.
+"""
+
+import httpx
+from .config import get_settings
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled async HTTP client shared by the application services."""
+    settings = get_settings()
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry
+        ),
+        timeout=settings.http_timeout
+    )
@@ -10,11 +10,38 @@ from datetime import datetime
 from dotenv import load_dotenv
 
 
+logger = logging.getLogger(__name__)
+
+
+# Replacements for problematic Unicode characters in LLM input
+_CLEAN_TABLE = str.maketrans({
+    '\u2028': '\n',    # Line separator
+    '\u2029': '\n\n',  # Paragraph separator
+    '\u2018': "'",     # Left single quote
+    '\u2019': "'",     # Right single quote
+    '\u201c': '"',     # Left double quote
+    '\u201d': '"',     # Right double quote
+    '\u202f': ' ',     # Narrow no-break space
+})
+
+# Control characters and separators stripped from secrets
+_SANITIZE_TABLE = str.maketrans('', '', (
+    '\r'        # Carriage return
+    '\n'        # Line feed
+    '\t'        # Tab
+    '\u2028'    # Line separator
+    '\u2029'    # Paragraph separator
+    '\u200b'    # Zero-width space
+    '\ufeff'    # BOM
+    '\u00a0'    # Non-breaking space
+    '\u202f'    # Narrow no-break space
+))
+
+
 def load_environment() -> None:
     """Load environment variables from .env file."""
     env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".env")
     load_dotenv(env_path)
-    logger = logging.getLogger(__name__)
     logger.info(f"Loaded environment from: {env_path}")
 
 
@@ -58,8 +85,7 @@ def create_sse_message(data: str, event: Optional[str] = None) -> str:
 
 def log_error(error: Exception, context: str = "") -> None:
     """Log an error with context information."""
-    logger = logging.getLogger(__name__)
-    logger.error(f"Error in {context}: {str(error)}", exc_info=True)
+    logger.error("Error in %s: %s", context, error, exc_info=True)
 
 
 def clean_unicode_text(text: str) -> str:
@@ -67,18 +93,7 @@ def clean_unicode_text(text: str) -> str:
     if not text:
         return text
     
-    # Replace line/paragraph separators with standard newlines
-    text = text.replace('\u2028', '\n')  # Line separator
-    text = text.replace('\u2029', '\n\n')  # Paragraph separator
-    
-    # Replace other problematic Unicode quotes/chars
-    text = text.replace('\u2018', "'")  # Left single quote
-    text = text.replace('\u2019', "'")  # Right single quote
-    text = text.replace('\u201c', '"')  # Left double quote
-    text = text.replace('\u201d', '"')  # Right double quote
-    text = text.replace('\u202f', ' ')  # Narrow no-break space
-    
-    return text
+    return text.translate(_CLEAN_TABLE)
 
 
 def sanitize_secret(secret: str) -> str:
@@ -86,19 +101,8 @@ def sanitize_secret(secret: str) -> str:
     if not secret:
         raise ValueError("Secret cannot be empty")
     
-    # Strip whitespace
-    secret = secret.strip()
-    
-    # Remove problematic control characters and separators
-    secret = secret.replace('\r', '')  # Carriage return
-    secret = secret.replace('\n', '')  # Line feed
-    secret = secret.replace('\t', '')  # Tab
-    secret = secret.replace('\u2028', '')  # Line separator
-    secret = secret.replace('\u2029', '')  # Paragraph separator
-    secret = secret.replace('\u200b', '')  # Zero-width space
-    secret = secret.replace('\ufeff', '')  # BOM
-    secret = secret.replace('\u00a0', '')  # Non-breaking space
-    secret = secret.replace('\u202f', '')  # Narrow no-break space
+    # Strip whitespace and remove problematic control characters and separators
+    secret = secret.strip().translate(_SANITIZE_TABLE)
     
     # Validate ASCII encoding
     try:
@@ -8,10 +8,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 from .core.config import get_settings
+from .core.http import create_http_client
 from .core.utils import setup_logging
 from .api.routes import router
 
 
+logger = logging.getLogger(__name__)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
@@ -23,20 +27,28 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     setup_logging("INFO" if not settings.debug else "DEBUG")
     
-    logger = logging.getLogger(__name__)
     logger.info("Starting FastAPI RAG backend...")
     logger.info(f"Debug mode: {settings.debug}")
     
-    # Verify services can be initialized
+    # Shared HTTP connection pool for outbound API calls
+    app.state.http = create_http_client()
+    app.state.rag_chain = None
+    
+    # Initialize services and store them on the application state
     try:
-        from .services.llm_service import get_llm_service
-        from .services.search_service import get_search_service
-        from .chains.rag_chain import get_rag_chain
+        from .services.llm_service import LLMService
+        from .services.search_service import SearchService
+        from .chains.rag_chain import RAGChain
+        
+        llm_service = LLMService(http_client=app.state.http)
+        
+        try:
+            search_service = SearchService()
+        except Exception as e:
+            logger.warning(f"Search service unavailable: {e}")
+            search_service = None
         
-        # Initialize services
-        llm_service = get_llm_service()
-        search_service = get_search_service()
-        rag_chain = get_rag_chain()
+        app.state.rag_chain = RAGChain(llm_service, search_service)
         
         logger.info("All services initialized successfully")
         
@@ -48,6 +60,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down FastAPI RAG backend...")
+    if app.state.rag_chain is not None:
+        app.state.rag_chain.close()
+    await app.state.http.aclose()
 
 
 def create_app() -> FastAPI:
@@ -4,45 +4,51 @@ Provides streaming and non-streaming text generation capabilities.
 """
 
 from typing import AsyncGenerator, Optional
+import httpx
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.callbacks import AsyncCallbackHandler, BaseCallbackHandler
-from langchain_core.outputs import LLMResult
-import asyncio
 import logging
 from ..core.config import get_settings
 from ..core.utils import log_error, validate_api_keys, clean_unicode_text, sanitize_secret, mask_secret
 
 
-class StreamingCallbackHandler(AsyncCallbackHandler):
-    """Callback handler for streaming LLM responses."""
-    
-    def __init__(self):
-        self.tokens = []
-        self.token_queue = asyncio.Queue()
-        self.finished = False
-    
-    async def on_llm_new_token(self, token: str, **kwargs) -> None:
-        """Handle new token generation."""
-        await self.token_queue.put(token)
-    
-    async def on_llm_end(self, response: LLMResult, **kwargs) -> None:
-        """Handle LLM completion."""
-        self.finished = True
-        await self.token_queue.put(None)  # Signal completion
-    
-    async def on_llm_error(self, error: Exception, **kwargs) -> None:
-        """Handle LLM errors."""
-        self.finished = True
-        await self.token_queue.put(None)  # Signal completion even on error
+logger = logging.getLogger(__name__)
+
+
+# Fallback messages returned in place of (or appended to) a real answer
+ERROR_RESPONSE_PREFIXES = (
+    "Error generating response:",
+    "Error generating streaming response:",
+)
+
+
+def is_error_response(text: str) -> bool:
+    """Check whether a generated text contains an error fallback message."""
+    return any(prefix in text for prefix in ERROR_RESPONSE_PREFIXES)
+
+
+# Fixed system prompt shared by every request. It must stay byte-identical
+# (no timestamps or per-request data) so providers can reuse the cached prefix.
+SYSTEM_MESSAGE = SystemMessage(
+    content="""You are a helpful AI assistant. Provide accurate and helpful responses to user questions.
+
+When retrieved context is included with a question, base your answer on that context. If the context doesn't contain enough information to answer the question, acknowledge this and provide the best answer you can based on your general knowledge."""
+)
+
+# Dynamic parts go last so the stable prefix is as long as possible
+CONTEXT_PROMPT_TEMPLATE = """---
+Retrieved context:
+{context}
+
+User question: {query}"""
 
 
 class LLMService:
     """Service for interacting with Groq LLM through LangChain."""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.settings = get_settings()
-        self.logger = logging.getLogger(__name__)
+        self.http_client = http_client
         self._validate_configuration()
         self._initialize_llm()
     
@@ -54,9 +60,9 @@ class LLMService:
             )
             # Sanitize and store the API key
             self._groq_api_key = sanitize_secret(self.settings.groq_api_key)
-            self.logger.info(f"Groq API key validated: {mask_secret(self._groq_api_key)}")
+            logger.info(f"Groq API key validated: {mask_secret(self._groq_api_key)}")
         except ValueError as e:
-            self.logger.error(f"LLM Service configuration error: {e}")
+            logger.error(f"LLM Service configuration error: {e}")
             raise
     
     def _initialize_llm(self) -> None:
@@ -66,9 +72,10 @@ class LLMService:
                 groq_api_key=self._groq_api_key,
                 model=self.settings.groq_model,
                 temperature=self.settings.temperature,
-                max_tokens=self.settings.max_tokens
+                max_tokens=self.settings.max_tokens,
+                http_async_client=self.http_client
             )
-            self.logger.info(f"LLM service initialized with model: {self.settings.groq_model}")
+            logger.info(f"LLM service initialized with model: {self.settings.groq_model}")
         except Exception as e:
             log_error(e, "LLM initialization")
             raise
@@ -99,34 +106,16 @@ class LLMService:
     
     def _prepare_messages(self, query: str, context: Optional[str] = None):
         """Prepare messages for LLM input."""
-        messages = []
-        
         # Clean the query text to avoid Unicode encoding issues
         clean_query = clean_unicode_text(query)
         
         if context:
-            clean_context = clean_unicode_text(context)
-            system_prompt = f"""You are a helpful AI assistant that answers questions based on the provided context.
-            
-Context information:
-{clean_context}
-
-Please provide accurate and helpful answers based on this context. If the context doesn't contain enough information to answer the question, acknowledge this and provide the best answer you can based on your general knowledge."""
-            messages.append(SystemMessage(content=clean_unicode_text(system_prompt)))
+            # The template is plain ASCII, so only the dynamic parts need cleaning
+            user_prompt = CONTEXT_PROMPT_TEMPLATE.format(
+                context=clean_unicode_text(context),
+                query=clean_query
+            )
         else:
-            system_prompt = "You are a helpful AI assistant. Provide accurate and helpful responses to user questions."
-            messages.append(SystemMessage(content=system_prompt))
+            user_prompt = clean_query
         
-        messages.append(HumanMessage(content=clean_query))
-        return messages
-
-
-# Global LLM service instance
-_llm_service: Optional[LLMService] = None
-
-def get_llm_service() -> LLMService:
-    """Get or create the LLM service instance."""
-    global _llm_service
-    if _llm_service is None:
-        _llm_service = LLMService()
-    return _llm_service
\ No newline at end of file
+        return [SYSTEM_MESSAGE, HumanMessage(content=user_prompt)]
\ No newline at end of file
@@ -3,19 +3,55 @@ Search service using Tavily API with LangChain integration.
 Provides web search capabilities for external knowledge retrieval.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional, Tuple
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
 from langchain_tavily import TavilySearch
 import logging
+import re
 from ..core.config import get_settings
 from ..core.utils import log_error, validate_api_keys, sanitize_secret, mask_secret
 
 
+logger = logging.getLogger(__name__)
+
+
+# Keywords that suggest current/real-time information is needed
+SEARCH_INDICATORS = (
+    "latest", "recent", "current", "today", "now", "2024", "2025",
+    "news", "update", "what happened", "breaking", "price",
+    "weather", "stock", "market"
+)
+
+# Per-result content budget in UTF-8 bytes, which tracks LLM token cost more
+# closely than code points for non-ASCII text
+SEARCH_CONTENT_MAX_BYTES = 500
+
+
+def truncate_utf8(text: str, max_bytes: int) -> str:
+    """Truncate text to at most max_bytes of UTF-8, appending an ellipsis if cut."""
+    # Every code point is at most 4 bytes, so short text never needs encoding
+    if len(text) * 4 <= max_bytes:
+        return text
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", errors="ignore") + "..."
+
+
 class SearchService:
     """Service for web search using Tavily API."""
     
     def __init__(self):
         self.settings = get_settings()
-        self.logger = logging.getLogger(__name__)
+        # Single alternation pattern so indicator matching is one pass over the query
+        self._indicator_re = re.compile(
+            "|".join(re.escape(indicator) for indicator in SEARCH_INDICATORS),
+            re.IGNORECASE
+        )
+        # Formatted contexts keyed by the ordered result URLs and content hashes
+        self._ctx_cache: "OrderedDict[Tuple[Tuple[str, int], ...], str]" = OrderedDict()
         self._validate_configuration()
         self._initialize_search_tool()
     
@@ -27,9 +63,9 @@ class SearchService:
             )
             # Sanitize and store the API key
             self._tavily_api_key = sanitize_secret(self.settings.tavily_api_key)
-            self.logger.info(f"Tavily API key validated: {mask_secret(self._tavily_api_key)}")
+            logger.info(f"Tavily API key validated: {mask_secret(self._tavily_api_key)}")
         except ValueError as e:
-            self.logger.error(f"Search Service configuration error: {e}")
+            logger.error(f"Search Service configuration error: {e}")
             raise
     
     def _initialize_search_tool(self) -> None:
@@ -39,7 +75,7 @@ class SearchService:
                 api_key=self._tavily_api_key,
                 max_results=self.settings.tavily_max_results
             )
-            self.logger.info("Search service initialized with Tavily")
+            logger.info("Search service initialized with Tavily")
         except Exception as e:
             log_error(e, "Search tool initialization")
             raise
@@ -47,16 +83,20 @@ class SearchService:
     async def search(self, query: str) -> List[Dict[str, Any]]:
         """Perform a web search and return results."""
         try:
-            self.logger.info(f"Performing search for query: {query}")
+            logger.info("Performing search for query: %s", query)
             
             # Use the Tavily search tool
             results = await self.search_tool.ainvoke(query)
             
+            # TavilySearch returns a {"query", "results": [...], ...} envelope
+            if isinstance(results, dict) and "results" in results:
+                results = results.get("results") or []
+            
             # Ensure results is a list
             if not isinstance(results, list):
                 results = [results] if results else []
             
-            self.logger.info(f"Search returned {len(results)} results")
+            logger.info("Search returned %d results", len(results))
             return results
             
         except Exception as e:
@@ -73,6 +113,14 @@ class SearchService:
         if not results:
             return "No search results found."
         
+        # Results with the same documents and snippets share one context string
+        key = self._context_cache_key(results)
+        if key is not None:
+            cached = self._ctx_cache.get(key)
+            if cached is not None:
+                self._ctx_cache.move_to_end(key)
+                return cached
+        
         formatted_results = []
         for i, result in enumerate(results, 1):
             # Handle different result formats from Tavily
@@ -86,37 +134,53 @@ class SearchService:
                 content = str(result)
                 url = ""
             
-            formatted_result = f"{i}. {title}"
-            if content:
-                # Limit content length to avoid token limits
-                content_preview = content[:500] + "..." if len(content) > 500 else content
-                formatted_result += f"\n{content_preview}"
-            if url:
-                formatted_result += f"\nSource: {url}"
-                
-            formatted_results.append(formatted_result)
+            content_block = f"\n{truncate_utf8(content, SEARCH_CONTENT_MAX_BYTES)}" if content else ""
+            source_block = f"\nSource: {url}" if url else ""
+            formatted_results.append(f"{i}. {title}{content_block}{source_block}")
         
-        return "\n\n".join(formatted_results)
+        context = "\n\n".join(formatted_results)
+        
+        if key is not None and self.settings.search_context_cache_size > 0:
+            self._ctx_cache[key] = context
+            while len(self._ctx_cache) > self.settings.search_context_cache_size:
+                self._ctx_cache.popitem(last=False)
+        
+        return context
+    
+    def _context_cache_key(self, results: List[Dict[str, Any]]) -> Optional[Tuple[Tuple[str, int], ...]]:
+        """Build a context cache key from result URLs and contents, or None if any result lacks a URL."""
+        key = []
+        for result in results:
+            url = result.get("url", result.get("link", "")) if isinstance(result, dict) else ""
+            if not url:
+                return None
+            # Snippets depend on the query and pages change over time, so the URL alone is not enough
+            title = result.get("title", result.get("name", ""))
+            content = result.get("content", result.get("snippet", result.get("description", "")))
+            key.append((url, hash((title, content))))
+        return tuple(key)
     
     def is_search_needed(self, query: str) -> bool:
         """Determine if a search is needed based on the query."""
-        # Keywords that suggest current/real-time information is needed
-        search_indicators = [
-            "latest", "recent", "current", "today", "now", "2024", "2025",
-            "news", "update", "what happened", "breaking", "price",
-            "weather", "stock", "market"
-        ]
+        return self._indicator_re.search(query) is not None
+    
+    def is_search_needed_batch(self, queries: Iterable[str]) -> List[bool]:
+        """Determine for each query whether a search is needed, scanning the batch in one pass."""
+        queries = list(queries)
+        needed = [False] * len(queries)
+        if not queries:
+            return needed
         
-        query_lower = query.lower()
-        return any(indicator in query_lower for indicator in search_indicators)
-
-
-# Global search service instance
-_search_service: Optional[SearchService] = None
-
-def get_search_service() -> SearchService:
-    """Get or create the search service instance."""
-    global _search_service
-    if _search_service is None:
-        _search_service = SearchService()
-    return _search_service
\ No newline at end of file
+        # Join with a separator no indicator contains, so matches never span two queries
+        starts = list(accumulate((len(query) + 1 for query in queries[:-1]), initial=0))
+        text = "\0".join(queries)
+        
+        pos = 0
+        while (match := self._indicator_re.search(text, pos)) is not None:
+            index = bisect_right(starts, match.start()) - 1
+            needed[index] = True
+            # One match is enough, continue from the next query
+            if index + 1 == len(starts):
+                break
+            pos = starts[index + 1]
+        return needed
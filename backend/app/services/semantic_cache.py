@@ -0,0 +1,95 @@
+"""
+Semantic response cache using local query embeddings.
+Returns cached answers for paraphrased queries via cosine similarity.
+"""
+
+from typing import List, Optional
+from collections import OrderedDict
+import asyncio
+import logging
+import time
+import numpy as np
+from ..core.config import get_settings
+from ..core.utils import log_error
+
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Cache of answers keyed by query embeddings, matched by cosine similarity."""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.threshold = self.settings.semantic_cache_threshold
+        self.maxsize = max(self.settings.semantic_cache_size, 0)
+        self.ttl = self.settings.response_cache_ttl
+        # Row i of the matrix holds the embedding stored in slot i
+        self._matrix: Optional[np.ndarray] = None
+        self._responses: List[Optional[str]] = [None] * self.maxsize
+        self._expires_at = np.zeros(self.maxsize)
+        self._use_search = np.zeros(self.maxsize, dtype=bool)
+        # Occupied slots from least to most recently used
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._initialize_model()
+
+    def _initialize_model(self) -> None:
+        """Initialize the local embedding model."""
+        try:
+            from fastembed import TextEmbedding
+
+            self.model = TextEmbedding(model_name=self.settings.semantic_cache_model)
+            logger.info(f"Semantic cache initialized with model: {self.settings.semantic_cache_model}")
+        except Exception as e:
+            log_error(e, "Semantic cache initialization")
+            raise
+
+    def _embed_sync(self, text: str) -> np.ndarray:
+        """Embed a query and return a unit-length vector."""
+        vector = np.asarray(next(iter(self.model.embed([text.strip().lower()]))), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed a query without blocking the event loop."""
+        return await asyncio.to_thread(self._embed_sync, text)
+
+    def get(self, vector: np.ndarray, use_search: bool) -> Optional[str]:
+        """Return the cached answer of the most similar query above the threshold."""
+        if not self._lru:
+            return None
+
+        # Compare against every entry; cached vectors are unit length, so the
+        # dot product is the cosine similarity
+        sims = self._matrix @ vector
+        stale = (self._expires_at <= time.monotonic()) | (self._use_search != use_search)
+        sims[stale] = -np.inf
+        best = int(sims.argmax())
+        if sims[best] < self.threshold:
+            return None
+
+        logger.info(f"Semantic cache hit (similarity {sims[best]:.3f})")
+        self._lru.move_to_end(best)
+        return self._responses[best]
+
+    def set(self, vector: np.ndarray, use_search: bool, response: str) -> None:
+        """Store an answer for a query embedding."""
+        if self.maxsize <= 0:
+            return
+
+        if self._matrix is None:
+            self._matrix = np.zeros((self.maxsize, vector.shape[0]), dtype=np.float32)
+
+        if len(self._lru) < self.maxsize:
+            slot = len(self._lru)
+        else:
+            # Reuse an expired slot before evicting the least recently used entry
+            expired = np.flatnonzero(self._expires_at <= time.monotonic())
+            slot = int(expired[0]) if expired.size else next(iter(self._lru))
+            del self._lru[slot]
+
+        self._matrix[slot] = vector
+        self._responses[slot] = response
+        self._expires_at[slot] = time.monotonic() + self.ttl
+        self._use_search[slot] = use_search
+        self._lru[slot] = None